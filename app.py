@@ -1,12 +1,15 @@
 import logging
+import secrets
 import time
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, FastAPI, Header, Query, HTTPException
 from environs import Env
 from psycopg2 import OperationalError
 
 from src.app_config import AppConfig
 from src.db_manager import DBManager
-from src.utils import prepare_db, search_contacts, get_valid_fields
+from src.query_log import SlowQueryLog
+from src.sync_scheduler import SyncScheduler, load_status
+from src.utils import migrate_db, search_contacts, get_valid_fields
 
 
 app = FastAPI()
@@ -18,6 +21,8 @@ logger = logging.getLogger(__name__)
 app_config = AppConfig.from_env(env)
 time.sleep(30)
 db_manager = DBManager(app_config.db_config)
+slow_query_log = SlowQueryLog(app_config.slow_query_config)
+sync_scheduler = SyncScheduler(db_manager, app_config.nimble_api_config, app_config.sync_config)
 
 
 @app.on_event("startup")
@@ -36,24 +41,77 @@ async def startup_init():
     else:
         logger.error("Failed to connect to the database after multiple attempts. Exiting...")
         exit(1)
-    prepare_db(db_manager, app_config.nimble_api_config)
+    migrate_db(db_manager)
+    if not app_config.sync_config.SYNC_ENABLED:
+        logger.info("Nimble sync is disabled in the application process.")
+        return
+    # The first run is a full reload and starts at once in a worker thread.
+    sync_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_handler():
+    """Stop the sync scheduler on application shutdown."""
+    await sync_scheduler.stop()
 
 
 @app.get('/search')
 async def search_handler(
+    background_tasks: BackgroundTasks,
     query: str = Query("", min_length=1),
     fields: str = Query(""),
 ):
     """Handle the search request."""
     valid_fields = get_valid_fields(fields)
     try:
-        contacts = search_contacts(db_manager, query, valid_fields)
+        contacts = search_contacts(db_manager, query, valid_fields, slow_query_log, background_tasks)
         return contacts
     except Exception as exc:
         logger.error(f"Failed to perform full-text search: {exc}")
         raise HTTPException(status_code=500, detail="Failed to perform full-text search.")
 
 
+def check_admin_token(x_admin_token: str = Header("")):
+    """Allow the admin endpoints only with the configured token. Without a token they are disabled."""
+    admin_token = app_config.admin_config.ADMIN_TOKEN
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+admin_router = APIRouter(prefix='/admin', dependencies=[Depends(check_admin_token)])
+
+
+@admin_router.get('/slow-queries')
+async def slow_queries_handler(
+    fingerprint: str = Query(None),
+):
+    """Return the slow search queries and their sampled plans grouped by query fingerprint."""
+    return slow_query_log.get_plans(fingerprint)
+
+
+@admin_router.get('/sync-status')
+async def sync_status_handler():
+    """Return the state of the Nimble sync scheduler, saved by the standalone worker if sync is disabled here."""
+    if app_config.sync_config.SYNC_ENABLED:
+        return sync_scheduler.get_status()
+    try:
+        status = load_status(db_manager)
+    except Exception as exc:
+        logger.error(f"Failed to load the Nimble sync status: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to load the Nimble sync status.")
+    if status is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Nimble sync runs in a separate worker that has not reported its status yet.",
+        )
+    return status
+
+
+app.include_router(admin_router)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
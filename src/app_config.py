@@ -58,18 +58,91 @@ class NimbleAPIConfig():
         return f"NimbleAPIConfig: \n{self.to_json(indent=4, sort_keys=True)}"
 
 
+@dataclass_json
+@dataclass
+class SlowQueryConfig():
+    """A configuration class for the slow-query log."""
+    SLOW_QUERY_THRESHOLD_MS: float = None
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = None
+    SLOW_QUERY_MAX_PLANS: int = None
+    SLOW_QUERY_MAX_FINGERPRINTS: int = None
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = None
+
+    @staticmethod
+    def from_env(env: Env) -> "SlowQueryConfig":
+        config = SlowQueryConfig()
+        with env.prefixed('SLOW_QUERY_'):
+            config.SLOW_QUERY_THRESHOLD_MS = env.float("THRESHOLD_MS", 200.0, validate=mav.Range(min=0))
+            config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE = env.float("EXPLAIN_SAMPLE_RATE", 0.1, validate=mav.Range(min=0, max=1))
+            config.SLOW_QUERY_MAX_PLANS = env.int("MAX_PLANS", 10, validate=mav.Range(min=1))
+            config.SLOW_QUERY_MAX_FINGERPRINTS = env.int("MAX_FINGERPRINTS", 100, validate=mav.Range(min=1))
+            config.SLOW_QUERY_EXPLAIN_TIMEOUT_MS = env.int("EXPLAIN_TIMEOUT_MS", 5000, validate=mav.Range(min=1))
+        return config
+
+    def __repr__(self) -> str:
+        return f"SlowQueryConfig: \n{self.to_json(indent=4, sort_keys=True)}"
+
+
+@dataclass_json
+@dataclass
+class SyncConfig():
+    """A configuration class for the Nimble sync scheduler."""
+    SYNC_ENABLED: bool = None
+    SYNC_INTERVAL_SECONDS: int = None
+    SYNC_JITTER_SECONDS: int = None
+    SYNC_MAX_BACKOFF_SECONDS: int = None
+    SYNC_FULL_INTERVAL_SECONDS: int = None
+
+    @staticmethod
+    def from_env(env: Env) -> "SyncConfig":
+        config = SyncConfig()
+        with env.prefixed('SYNC_'):
+            config.SYNC_ENABLED = env.bool("ENABLED", True)
+            config.SYNC_INTERVAL_SECONDS = env.int("INTERVAL_SECONDS", 300, validate=mav.Range(min=1))
+            config.SYNC_JITTER_SECONDS = env.int("JITTER_SECONDS", 30, validate=mav.Range(min=0))
+            config.SYNC_MAX_BACKOFF_SECONDS = env.int("MAX_BACKOFF_SECONDS", 3600, validate=mav.Range(min=1))
+            config.SYNC_FULL_INTERVAL_SECONDS = env.int("FULL_INTERVAL_SECONDS", 86400, validate=mav.Range(min=1))
+        return config
+
+    def __repr__(self) -> str:
+        return f"SyncConfig: \n{self.to_json(indent=4, sort_keys=True)}"
+
+
+@dataclass_json
+@dataclass
+class AdminConfig():
+    """A configuration class for the admin endpoints."""
+    ADMIN_TOKEN: str = None
+
+    @staticmethod
+    def from_env(env: Env) -> "AdminConfig":
+        config = AdminConfig()
+        with env.prefixed('ADMIN_'):
+            config.ADMIN_TOKEN = env.str("TOKEN", "")
+        return config
+
+    def __repr__(self) -> str:
+        return f"AdminConfig: \n{self.to_json(indent=4, sort_keys=True)}"
+
+
 @dataclass_json
 @dataclass
 class AppConfig():
     """A configuration class for the entire application."""
     db_config: DBConfig = None
     nimble_api_config: NimbleAPIConfig = None
+    slow_query_config: SlowQueryConfig = None
+    sync_config: SyncConfig = None
+    admin_config: AdminConfig = None
 
     @staticmethod
     def from_env(env: Env) -> "AppConfig":
         config = AppConfig()
         config.db_config = DBConfig.from_env(env)
         config.nimble_api_config = NimbleAPIConfig.from_env(env)
+        config.slow_query_config = SlowQueryConfig.from_env(env)
+        config.sync_config = SyncConfig.from_env(env)
+        config.admin_config = AdminConfig.from_env(env)
         return config
 
     def __repr__(self) -> str:
@@ -2,11 +2,11 @@ import logging
 from environs import Env
 
 try:
-    from utils import prepare_db
+    from utils import migrate_db, prepare_db
     from app_config import AppConfig
     from db_manager import DBManager
 except ModuleNotFoundError:
-    from src.utils import prepare_db
+    from src.utils import migrate_db, prepare_db
     from src.app_config import AppConfig
     from src.db_manager import DBManager
 
@@ -17,6 +17,7 @@ def cron_job_main(logger):
     app_config = AppConfig.from_env(env)
     db_manager = DBManager(app_config.db_config)
 
+    migrate_db(db_manager)
     prepare_db(db_manager, app_config.nimble_api_config)
 
 
@@ -16,7 +16,7 @@ class DBManager:
     def __init__(self, db_config: DBConfig, minconn=1, maxconn=10):
         self.conn_pool = None
         try:
-            self.conn_pool = psycopg2.pool.SimpleConnectionPool(
+            self.conn_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=minconn,
                 maxconn=maxconn,
                 host=db_config.DB_HOST,
@@ -31,7 +31,7 @@ class DBManager:
 
         if not self.conn_pool:
             try:
-                self.conn_pool = psycopg2.pool.SimpleConnectionPool(
+                self.conn_pool = psycopg2.pool.ThreadedConnectionPool(
                     minconn=minconn,
                     maxconn=maxconn,
                     host=db_config.DB_CONTAINER_NAME,
@@ -46,7 +46,7 @@ class DBManager:
 
         if not self.conn_pool:
             try:
-                self.conn_pool = psycopg2.pool.SimpleConnectionPool(
+                self.conn_pool = psycopg2.pool.ThreadedConnectionPool(
                     minconn=minconn,
                     maxconn=maxconn,
                     host=db_config.DB_SERVICE_NAME,
@@ -68,7 +68,7 @@ class DBManager:
 class _DBContextManager:
     """Context manager for the database connection."""
 
-    def __init__(self, conn_pool: psycopg2.pool.SimpleConnectionPool):
+    def __init__(self, conn_pool: psycopg2.pool.ThreadedConnectionPool):
         self.conn_pool = conn_pool
 
     def __enter__(self):
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+try:
+    from app_config import SlowQueryConfig
+    from db_manager import DBManager
+except ModuleNotFoundError:
+    from src.app_config import SlowQueryConfig
+    from src.db_manager import DBManager
+
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+def get_query_fingerprint(query: str) -> str:
+    """Build a stable fingerprint of the query shape (whitespace-insensitive)."""
+    normalized_query = ' '.join(query.split())
+    return hashlib.md5(normalized_query.encode('utf-8')).hexdigest()[:16]
+
+
+def has_seq_scan(plan: dict) -> bool:
+    """Check whether an EXPLAIN JSON plan node or any of its children is a sequential scan."""
+    if plan.get("Node Type") == "Seq Scan":
+        return True
+    return any(has_seq_scan(child) for child in plan.get("Plans", []))
+
+
+def explain_query(db_manager: DBManager, query: str, params: tuple, timeout_ms: int) -> dict:
+    """Run EXPLAIN (ANALYZE, BUFFERS) for the query on a pooled connection and return the JSON plan."""
+    with db_manager.connect() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SET LOCAL statement_timeout = %s;", (timeout_ms,))
+                cur.execute(EXPLAIN_PREFIX + query, params)
+                plan = cur.fetchone()[0]
+            finally:
+                conn.rollback()
+    return plan[0]
+
+
+class SlowQueryLog:
+    """Log slow search queries and keep sampled EXPLAIN ANALYZE plans grouped by query fingerprint.
+    Only the SLOW_QUERY_MAX_FINGERPRINTS most recently seen fingerprints are kept."""
+
+    def __init__(self, slow_query_config: SlowQueryConfig):
+        self.threshold_ms = slow_query_config.SLOW_QUERY_THRESHOLD_MS
+        self.sample_rate = slow_query_config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        self.max_plans = slow_query_config.SLOW_QUERY_MAX_PLANS
+        self.max_fingerprints = slow_query_config.SLOW_QUERY_MAX_FINGERPRINTS
+        self.explain_timeout_ms = slow_query_config.SLOW_QUERY_EXPLAIN_TIMEOUT_MS
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return duration_ms >= self.threshold_ms
+
+    def should_explain(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def record(self, query: str, search_fields: list, row_count: int, duration_ms: float) -> str:
+        """Record a slow execution. Return the query fingerprint."""
+        fingerprint = get_query_fingerprint(query)
+        logger.warning(
+            f"Slow search query {fingerprint}: fields={','.join(search_fields)}, "
+            f"rows={row_count}, duration={duration_ms:.1f} ms, query={' '.join(query.split())}"
+        )
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = {
+                    "fingerprint": fingerprint,
+                    "query": ' '.join(query.split()),
+                    "fields": list(search_fields),
+                    "slow_count": 0,
+                    "max_duration_ms": 0.0,
+                    "seq_scan": False,
+                    "plans": deque(maxlen=self.max_plans),
+                }
+                self._entries[fingerprint] = entry
+                if len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(fingerprint)
+            entry["slow_count"] += 1
+            entry["max_duration_ms"] = max(entry["max_duration_ms"], duration_ms)
+        return fingerprint
+
+    def add_plan(self, fingerprint: str, plan: dict) -> None:
+        """Store an EXPLAIN ANALYZE plan for an already recorded fingerprint."""
+        root = plan.get("Plan", {})
+        seq_scan = has_seq_scan(root)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return
+            entry["seq_scan"] = entry["seq_scan"] or seq_scan
+            entry["plans"].append({
+                "recorded_at": time.time(),
+                "rows": root.get("Actual Rows"),
+                "duration_ms": plan.get("Execution Time"),
+                "seq_scan": seq_scan,
+                "plan": plan,
+            })
+
+    def explain(self, db_manager: DBManager, fingerprint: str, query: str, params: tuple) -> None:
+        """Explain a slow query and store its plan. Meant to run after the response is sent."""
+        try:
+            plan = explain_query(db_manager, query, params, self.explain_timeout_ms)
+        except Exception as exc:
+            logger.warning(f"Failed to explain slow search query {fingerprint}: {exc}")
+            return
+        self.add_plan(fingerprint, plan)
+
+    def get_plans(self, fingerprint: str = None) -> list:
+        """Return the recorded slow queries, optionally only the one with the given fingerprint."""
+        with self._lock:
+            return [
+                {**entry, "plans": list(entry["plans"])}
+                for entry in self._entries.values()
+                if fingerprint is None or entry["fingerprint"] == fingerprint
+            ]
+
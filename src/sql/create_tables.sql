@@ -1,7 +1,15 @@
 DROP TABLE IF EXISTS contacts;
+DROP TABLE IF EXISTS sync_status;
 CREATE TABLE contacts (
     id SERIAL PRIMARY KEY,
+    nimble_id VARCHAR(40),
     first_name VARCHAR(40) NOT NULL,
     last_name VARCHAR(40) NOT NULL,
     email VARCHAR(150)
 );
+CREATE UNIQUE INDEX contacts_nimble_id_idx ON contacts (nimble_id);
+CREATE TABLE sync_status (
+    id INTEGER PRIMARY KEY,
+    status JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime
+
+try:
+    from app_config import NimbleAPIConfig, SyncConfig
+    from db_manager import DBManager
+    from utils import get_contacts, load_sync_status, save_sync_status, update_db, upsert_db
+except ModuleNotFoundError:
+    from src.app_config import NimbleAPIConfig, SyncConfig
+    from src.db_manager import DBManager
+    from src.utils import get_contacts, load_sync_status, save_sync_status, update_db, upsert_db
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_staleness(status: dict) -> float:
+    """Get the age in seconds of the data synced by the last successful run."""
+    last_success_at = status.get("last_success_at")
+    return time.time() - last_success_at if last_success_at else None
+
+
+def load_status(db_manager: DBManager) -> dict:
+    """Load the state saved by the scheduler of any process. Return None if no scheduler has saved it yet."""
+    status = load_sync_status(db_manager)
+    if status is not None:
+        status["staleness_seconds"] = get_staleness(status)
+    return status
+
+
+class SyncScheduler:
+    """Periodically sync the 'contacts' database table with the Nimble API.
+
+    Runs a full reload on the first run and every SYNC_FULL_INTERVAL_SECONDS,
+    and delta syncs of the contacts updated since the last successful run in between."""
+
+    def __init__(self, db_manager: DBManager, nimble_api_config: NimbleAPIConfig, sync_config: SyncConfig):
+        self.db_manager = db_manager
+        self.nimble_api_config = nimble_api_config
+        self.interval = sync_config.SYNC_INTERVAL_SECONDS
+        self.jitter = sync_config.SYNC_JITTER_SECONDS
+        self.max_backoff = sync_config.SYNC_MAX_BACKOFF_SECONDS
+        self.full_interval = sync_config.SYNC_FULL_INTERVAL_SECONDS
+        self.last_run_at = None
+        self.last_run_duration = None
+        self.last_run_full = None
+        self.last_rows_loaded = None
+        self.last_rows_changed = None
+        self.last_success_at = None
+        self.last_full_sync_at = None
+        self.last_error = None
+        self.consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._task = None
+
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    def get_next_delay(self) -> float:
+        """Get the delay before the next run: the interval on success, exponential backoff on failures."""
+        delay = self.interval * 2 ** self.consecutive_failures
+        return min(delay, self.max_backoff) + random.uniform(0, self.jitter)
+
+    def run_once(self, full: bool = None) -> bool:
+        """Run a single sync unless another one is in progress. Return whether the sync succeeded."""
+        if not self._lock.acquire(blocking=False):
+            logger.warning("Skipping the Nimble sync: the previous run is still in progress.")
+            return False
+        try:
+            self._save_status()
+            return self._sync(full)
+        finally:
+            self._lock.release()
+            self._save_status()
+
+    def _save_status(self) -> None:
+        """Save the state so that other processes (e.g. the app next to a standalone worker) can report it."""
+        status = self.get_status()
+        del status["staleness_seconds"]
+        try:
+            save_sync_status(self.db_manager, status)
+        except Exception as exc:
+            logger.warning(f"Failed to save the Nimble sync status: {exc}")
+
+    def _sync(self, full: bool = None) -> bool:
+        started_at = time.time()
+        if full is None:
+            full = self.last_full_sync_at is None or started_at - self.last_full_sync_at >= self.full_interval
+        self.last_run_at = started_at
+        self.last_run_full = full
+        try:
+            updated_since = None if full else datetime.utcfromtimestamp(self.last_success_at)
+            nimble_contacts = get_contacts(self.nimble_api_config, updated_since)
+            if not nimble_contacts:
+                raise RuntimeError("Failed to get contacts from Nimble API.")
+            if full:
+                rows = update_db(self.db_manager, nimble_contacts)
+            else:
+                rows = upsert_db(self.db_manager, nimble_contacts)
+        except Exception as exc:
+            self.consecutive_failures += 1
+            self.last_error = str(exc)
+            logger.error(f"Nimble sync failed (failure {self.consecutive_failures} in a row): {exc}")
+            return False
+        finally:
+            self.last_run_duration = time.time() - started_at
+
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_success_at = started_at
+        if full:
+            self.last_rows_loaded = rows
+            self.last_full_sync_at = started_at
+            logger.info(f"Nimble full sync finished in {self.last_run_duration:.1f} s, rows loaded: {rows}")
+        else:
+            self.last_rows_changed = rows
+            logger.info(f"Nimble delta sync finished in {self.last_run_duration:.1f} s, rows changed: {rows}")
+        return True
+
+    async def run_forever(self) -> None:
+        """Run syncs in a worker thread until cancelled. The first sync starts at once unless one has already run."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.last_run_at is not None:
+                await asyncio.sleep(self.get_next_delay())
+            await loop.run_in_executor(None, self.run_once)
+
+    def start(self) -> None:
+        """Start the scheduler on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        """Stop the scheduler started with start()."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> dict:
+        """Get the scheduler state for monitoring.
+        last_rows_loaded is the size of the last full reload, last_rows_changed is the
+        number of rows inserted or updated by the last delta sync."""
+        status = {
+            "running": self.is_running(),
+            "last_run_at": self.last_run_at,
+            "last_run_duration_seconds": self.last_run_duration,
+            "last_run_full": self.last_run_full,
+            "last_rows_loaded": self.last_rows_loaded,
+            "last_rows_changed": self.last_rows_changed,
+            "last_success_at": self.last_success_at,
+            "last_full_sync_at": self.last_full_sync_at,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+        status["staleness_seconds"] = get_staleness(status)
+        return status
@@ -0,0 +1,32 @@
+import asyncio
+import logging
+from environs import Env
+
+try:
+    from app_config import AppConfig
+    from db_manager import DBManager
+    from sync_scheduler import SyncScheduler
+    from utils import migrate_db
+except ModuleNotFoundError:
+    from src.app_config import AppConfig
+    from src.db_manager import DBManager
+    from src.sync_scheduler import SyncScheduler
+    from src.utils import migrate_db
+
+
+def sync_worker_main(logger):
+    logger.info("Starting the Nimble sync worker for the 'contacts' database table")
+    env = Env()
+    app_config = AppConfig.from_env(env)
+    db_manager = DBManager(app_config.db_config)
+    migrate_db(db_manager)
+    sync_scheduler = SyncScheduler(db_manager, app_config.nimble_api_config, app_config.sync_config)
+
+    asyncio.run(sync_scheduler.run_forever())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logger = logging.getLogger(__name__)
+
+    sync_worker_main(logger)
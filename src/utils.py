@@ -1,15 +1,20 @@
 import csv
+import json
 import logging
 import requests
+import time
+from datetime import datetime, timedelta
 from psycopg2 import OperationalError
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import Json, RealDictCursor
 
 try:
     from app_config import NimbleAPIConfig
     from db_manager import DBManager
+    from query_log import SlowQueryLog
 except ModuleNotFoundError:
     from src.app_config import NimbleAPIConfig
     from src.db_manager import DBManager
+    from src.query_log import SlowQueryLog
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +22,17 @@ logger = logging.getLogger(__name__)
 CSV_FILE_PATH = "src/Nimble Contacts - Sheet1.csv"
 VALID_FIELDS = ["first_name", "last_name", "email"]
 HUMAN_READABLE_FIELDS = [field.replace('_', ' ') for field in VALID_FIELDS]
+NIMBLE_DATE_FORMAT = "%Y-%m-%d"
+MIGRATION_QUERY = """
+    ALTER TABLE contacts ADD COLUMN IF NOT EXISTS nimble_id VARCHAR(40);
+    CREATE UNIQUE INDEX IF NOT EXISTS contacts_nimble_id_idx ON contacts (nimble_id);
+    CREATE TABLE IF NOT EXISTS sync_status (
+        id INTEGER PRIMARY KEY,
+        status JSONB NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+SYNC_STATUS_ID = 1
 
 
 def get_from_csv(file_path) -> list():
@@ -48,41 +64,79 @@ def init_db_with_csv(db_manager: DBManager, file_path: str) -> None:
             logger.error(f"Failed to initialize the database with csv file: {exc}")
 
 
-def get_contacts(nimble_api_config: NimbleAPIConfig) -> dict:
-    """Get contacts from the Nimble API."""
+def migrate_db(db_manager: DBManager) -> None:
+    """Bring an existing 'contacts' database table up to date with src/sql/create_tables.sql.
+    Run it once on startup: ALTER TABLE locks the table even when there is nothing to change."""
+    with db_manager.connect() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(MIGRATION_QUERY)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    logger.info("Successfully migrated contacts table.")
+
+
+def get_contacts(nimble_api_config: NimbleAPIConfig, updated_since: datetime = None) -> dict:
+    """Get contacts from the Nimble API (optionally only those updated since the given time).
+    All result pages are fetched; None is returned if any of them fails."""
     headers = {"Authorization": f"Bearer {nimble_api_config.NIMBLE_API_KEY}"}
     fields_to_get = ', '.join(HUMAN_READABLE_FIELDS)
     params = {"fields": fields_to_get}
-    response = requests.get(nimble_api_config.NIMBLE_API_URL, headers=headers, params=params)
-    if response.status_code == 200:
-        return response.json()
-    logger.error(f"Failed to get contacts from Nimble API. Status code: {response.status_code}")
+    if updated_since:
+        # Nimble filters by whole days, so the range may repeat already synced contacts.
+        date_range = {
+            "start_date": updated_since.strftime(NIMBLE_DATE_FORMAT),
+            "end_date": (datetime.utcnow() + timedelta(days=1)).strftime(NIMBLE_DATE_FORMAT),
+        }
+        params["query"] = json.dumps({"updated": {"range": date_range}})
+    nimble_contacts = None
+    page = 1
+    while True:
+        if page > 1:
+            params["page"] = page
+        response = requests.get(nimble_api_config.NIMBLE_API_URL, headers=headers, params=params)
+        if response.status_code != 200:
+            logger.error(f"Failed to get contacts from Nimble API. Status code: {response.status_code}")
+            return None
+        response_data = response.json()
+        if nimble_contacts is None:
+            nimble_contacts = response_data
+        else:
+            nimble_contacts["resources"].extend(response_data["resources"])
+        if page >= response_data.get("meta", {}).get("pages", 1):
+            return nimble_contacts
+        page += 1
+
+
+def get_contacts_data(nimble_contacts: dict) -> list:
+    """Extract (nimble_id, first_name, last_name, email) rows of persons from the Nimble API response."""
+    empty_value = [{"value": None}]
+    return [
+        (
+            contact.get("id"),
+            contact["fields"].get("first name", empty_value)[0].get("value", ""),
+            contact["fields"].get("last name", empty_value)[0].get("value", ""),
+            contact["fields"].get("email", empty_value)[0].get("value", ""),
+        ) for contact in nimble_contacts["resources"] if contact["record_type"] == "person"
+    ]
 
 
-def update_db(db_manager: DBManager, nimble_contacts: dict) -> None:
-    """Update the 'contacts' database table with data from the Nimble API."""
+def update_db(db_manager: DBManager, nimble_contacts: dict) -> int:
+    """Update the 'contacts' database table with data from the Nimble API.
+    Return the number of loaded contacts."""
     with db_manager.connect() as conn:
         with conn.cursor() as cur:
             conn.autocommit = False
             try:
                 cur.execute("DELETE FROM contacts;")
-                empty_value = [{"value": None}]
-                contacts_data = [
-                    (
-                        contact["fields"].get("first name", empty_value)[0].get("value", ""),
-                        contact["fields"].get("last name", empty_value)[0].get("value", ""),
-                        contact["fields"].get("email", empty_value)[0].get("value", ""),
-                    ) for contact in nimble_contacts["resources"] if contact["record_type"] == "person"
-                ]
+                contacts_data = get_contacts_data(nimble_contacts)
                 cur.executemany(
-                    "INSERT INTO contacts (first_name, last_name, email) VALUES (%s, %s, %s);",
+                    "INSERT INTO contacts (nimble_id, first_name, last_name, email) VALUES (%s, %s, %s, %s);",
                     contacts_data,
                 )
                 logger.info("Successfully updated contacts from Nimble API.")
-            except Exception as exc:
-                conn.rollback()
-                logger.error(f"Failed to update contacts: {exc}")
-            else:
                 create_query = """
                     CREATE INDEX IF NOT EXISTS contacts_fulltext_idx ON contacts
                     USING GIN (to_tsvector('english', first_name || ' ' || last_name || ' ' || email));
@@ -90,6 +144,65 @@ def update_db(db_manager: DBManager, nimble_contacts: dict) -> None:
                 cur.execute(create_query)
                 conn.commit()
                 logger.info("Successfully created index on contacts table.")
+            except Exception:
+                conn.rollback()
+                raise
+    return len(contacts_data)
+
+
+def upsert_db(db_manager: DBManager, nimble_contacts: dict) -> int:
+    """Insert new and update changed contacts from the Nimble API by their Nimble id.
+    Return the number of changed rows."""
+    contacts_data = [row for row in get_contacts_data(nimble_contacts) if row[0]]
+    upsert_query = """
+        INSERT INTO contacts (nimble_id, first_name, last_name, email) VALUES (%s, %s, %s, %s)
+        ON CONFLICT (nimble_id) DO UPDATE
+        SET first_name = EXCLUDED.first_name, last_name = EXCLUDED.last_name, email = EXCLUDED.email
+        WHERE (contacts.first_name, contacts.last_name, contacts.email)
+            IS DISTINCT FROM (EXCLUDED.first_name, EXCLUDED.last_name, EXCLUDED.email);
+    """
+    with db_manager.connect() as conn:
+        with conn.cursor() as cur:
+            conn.autocommit = False
+            try:
+                rows_changed = 0
+                if contacts_data:
+                    cur.executemany(upsert_query, contacts_data)
+                    rows_changed = max(cur.rowcount, 0)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    logger.info(f"Successfully upserted {rows_changed} changed contacts from Nimble API.")
+    return rows_changed
+
+
+def save_sync_status(db_manager: DBManager, status: dict) -> None:
+    """Save the sync scheduler state to the 'sync_status' database table."""
+    save_query = """
+        INSERT INTO sync_status (id, status) VALUES (%s, %s)
+        ON CONFLICT (id) DO UPDATE SET status = EXCLUDED.status, updated_at = now();
+    """
+    with db_manager.connect() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(save_query, (SYNC_STATUS_ID, Json(status)))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+
+def load_sync_status(db_manager: DBManager) -> dict:
+    """Load the sync scheduler state saved by save_sync_status. Return None if there is none yet."""
+    with db_manager.connect() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SELECT status FROM sync_status WHERE id = %s;", (SYNC_STATUS_ID,))
+                row = cur.fetchone()
+            finally:
+                conn.rollback()
+    return row[0] if row else None
 
 
 def prepare_db(
@@ -108,7 +221,7 @@ def prepare_db(
     try:
         update_db(db_manager, nimble_contacts)
     except Exception as exc:
-        logger.error(f"Failed to connect to the database: {exc}")
+        logger.error(f"Failed to update contacts: {exc}")
 
 
 def get_valid_fields(fields: str) -> list:
@@ -117,7 +230,7 @@ def get_valid_fields(fields: str) -> list:
         fields = fields.split(',')
         search_fields = [field.strip() for field in fields if field.strip() in VALID_FIELDS + HUMAN_READABLE_FIELDS]
         if len(search_fields) > 0:
-            return [field.replace(' ', '_') for field in search_fields]
+            return list(dict.fromkeys(field.replace(' ', '_') for field in search_fields))
     return VALID_FIELDS
 
 
@@ -126,19 +239,33 @@ def get_search_condition(search_fields: list) -> str:
     return " || ' ' || ".join(f'COALESCE({field}, \'\')' for field in search_fields)
 
 
-def search_contacts(db_manager: DBManager, query: str, search_fields: list):
-    """Perform a full-text search in the 'contacts' database table."""
+def search_contacts(
+    db_manager: DBManager,
+    query: str,
+    search_fields: list,
+    slow_query_log: SlowQueryLog = None,
+    background_tasks=None,
+):
+    """Perform a full-text search in the 'contacts' database table.
+    Slow executions are reported to the slow-query log (optional) and sampled ones
+    are explained later through background_tasks.add_task (optional)."""
     fields_condition = get_search_condition(search_fields)
     search_query = """
         SELECT *
         FROM contacts
         WHERE to_tsvector('english', {fields_condition}) @@ plainto_tsquery('english', %s);
     """
+    search_query = search_query.format(fields_condition=fields_condition)
     with db_manager.connect() as conn:
-        pass
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(search_query.format(fields_condition=fields_condition), (query,))
+            started_at = time.perf_counter()
+            cur.execute(search_query, (query,))
             contacts = cur.fetchall()
+            duration_ms = (time.perf_counter() - started_at) * 1000
+    if slow_query_log and slow_query_log.is_slow(duration_ms):
+        fingerprint = slow_query_log.record(search_query, search_fields, len(contacts), duration_ms)
+        if background_tasks is not None and slow_query_log.should_explain():
+            background_tasks.add_task(slow_query_log.explain, db_manager, fingerprint, search_query, (query,))
     return contacts
 
 
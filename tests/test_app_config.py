@@ -1,7 +1,7 @@
 import unittest
 from environs import Env
 
-from src.app_config import DBConfig, NimbleAPIConfig, AppConfig
+from src.app_config import DBConfig, NimbleAPIConfig, SlowQueryConfig, SyncConfig, AdminConfig, AppConfig
 
 
 class TestDBConfig(unittest.TestCase):
@@ -31,6 +31,44 @@ class TestNimbleAPIConfig(unittest.TestCase):
         self.assertEqual(nimble_api_config.NIMBLE_API_URL, "https://api.somecompany.com/api/v1/contacts")
 
 
+class TestSlowQueryConfig(unittest.TestCase):
+    def test_from_env(self):
+        env = Env()
+        env.read_env("tests/test.env", False)
+
+        slow_query_config = SlowQueryConfig.from_env(env)
+
+        self.assertEqual(slow_query_config.SLOW_QUERY_THRESHOLD_MS, 150.5)
+        self.assertEqual(slow_query_config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE, 0.25)
+        self.assertEqual(slow_query_config.SLOW_QUERY_MAX_PLANS, 5)
+        self.assertEqual(slow_query_config.SLOW_QUERY_MAX_FINGERPRINTS, 50)
+        self.assertEqual(slow_query_config.SLOW_QUERY_EXPLAIN_TIMEOUT_MS, 2000)
+
+
+class TestSyncConfig(unittest.TestCase):
+    def test_from_env(self):
+        env = Env()
+        env.read_env("tests/test.env", False)
+
+        sync_config = SyncConfig.from_env(env)
+
+        self.assertFalse(sync_config.SYNC_ENABLED)
+        self.assertEqual(sync_config.SYNC_INTERVAL_SECONDS, 120)
+        self.assertEqual(sync_config.SYNC_JITTER_SECONDS, 10)
+        self.assertEqual(sync_config.SYNC_MAX_BACKOFF_SECONDS, 1800)
+        self.assertEqual(sync_config.SYNC_FULL_INTERVAL_SECONDS, 43200)
+
+
+class TestAdminConfig(unittest.TestCase):
+    def test_from_env(self):
+        env = Env()
+        env.read_env("tests/test.env", False)
+
+        admin_config = AdminConfig.from_env(env)
+
+        self.assertEqual(admin_config.ADMIN_TOKEN, "your_admin_token")
+
+
 class TestAppConfig(unittest.TestCase):
     def test_from_env(self):
         env = Env()
@@ -40,6 +78,9 @@ class TestAppConfig(unittest.TestCase):
 
         self.assertIsInstance(app_config.db_config, DBConfig)
         self.assertIsInstance(app_config.nimble_api_config, NimbleAPIConfig)
+        self.assertIsInstance(app_config.slow_query_config, SlowQueryConfig)
+        self.assertIsInstance(app_config.sync_config, SyncConfig)
+        self.assertIsInstance(app_config.admin_config, AdminConfig)
 
 
 if __name__ == "__main__":
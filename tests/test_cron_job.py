@@ -8,11 +8,12 @@ from src.utils import HUMAN_READABLE_FIELDS
 
 
 class TestMain(unittest.TestCase):
+    @patch('src.cron_job.migrate_db')
     @patch('src.cron_job.Env')
     @patch('src.cron_job.AppConfig')
     @patch('src.cron_job.DBManager')
     @patch('requests.get')
-    def test_main(self, mock_get, mock_db_manager, mock_app_config, mock_env):
+    def test_main(self, mock_get, mock_db_manager, mock_app_config, mock_env, mock_migrate_db):
         mock_env_instance = mock_env.return_value
         mock_env_instance.read_env.return_value = None
         mock_app_config_instance = mock_app_config.from_env.return_value
@@ -45,6 +46,7 @@ class TestMain(unittest.TestCase):
         mock_env.assert_called_once()
         mock_app_config.from_env.assert_called_once_with(mock_env_instance)
         mock_db_manager.assert_called_once_with("dummy_db_config")
+        mock_migrate_db.assert_called_once_with(mock_db_manager_instance)
         mock_db_manager_instance.connect.assert_called_once()
         mock_get.assert_called_once_with(
             mock_app_config_instance.nimble_api_config.NIMBLE_API_URL,
@@ -5,7 +5,7 @@ from src.db_manager import DBManager, _DBContextManager
 
 
 class TestDBManager(unittest.TestCase):
-    @patch("src.db_manager.psycopg2.pool.SimpleConnectionPool")
+    @patch("src.db_manager.psycopg2.pool.ThreadedConnectionPool")
     def test_object_creation(self, mock_conn_pool_class):
         db_config = MagicMock()
         db_config.DB_HOST = "localhost"
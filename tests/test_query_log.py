@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.app_config import SlowQueryConfig
+from src.query_log import SlowQueryLog, explain_query, get_query_fingerprint, has_seq_scan, EXPLAIN_PREFIX
+
+
+class TestQueryLogUtils(unittest.TestCase):
+    def test_get_query_fingerprint(self):
+        fingerprint = get_query_fingerprint("SELECT *\n    FROM contacts;")
+
+        self.assertEqual(fingerprint, get_query_fingerprint("SELECT * FROM contacts;"))
+        self.assertNotEqual(fingerprint, get_query_fingerprint("SELECT id FROM contacts;"))
+
+    def test_has_seq_scan(self):
+        index_plan = {"Node Type": "Bitmap Heap Scan", "Plans": [{"Node Type": "Bitmap Index Scan"}]}
+        nested_plan = {"Node Type": "Gather", "Plans": [{"Node Type": "Seq Scan"}]}
+
+        self.assertFalse(has_seq_scan(index_plan))
+        self.assertTrue(has_seq_scan(nested_plan))
+
+    def test_explain_query(self):
+        db_manager = MagicMock()
+        plan = {"Plan": {"Node Type": "Seq Scan"}}
+
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = ([plan],)
+
+        mock_connection = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        db_manager.connect.return_value.__enter__.return_value = mock_connection
+
+        self.assertEqual(explain_query(db_manager, "SELECT 1;", (), 500), plan)
+        mock_cursor.execute.assert_any_call("SET LOCAL statement_timeout = %s;", (500,))
+        mock_cursor.execute.assert_called_with(EXPLAIN_PREFIX + "SELECT 1;", ())
+        mock_connection.rollback.assert_called_once()
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    def setUp(self):
+        self.slow_query_log = SlowQueryLog(SlowQueryConfig(
+            SLOW_QUERY_THRESHOLD_MS=100,
+            SLOW_QUERY_EXPLAIN_SAMPLE_RATE=0,
+            SLOW_QUERY_MAX_PLANS=2,
+            SLOW_QUERY_MAX_FINGERPRINTS=2,
+            SLOW_QUERY_EXPLAIN_TIMEOUT_MS=1000,
+        ))
+
+    def test_is_slow(self):
+        self.assertFalse(self.slow_query_log.is_slow(99.9))
+        self.assertTrue(self.slow_query_log.is_slow(100))
+        self.assertFalse(self.slow_query_log.should_explain())
+
+    def test_record(self):
+        plan = {"Plan": {"Node Type": "Seq Scan", "Actual Rows": 3}, "Execution Time": 250}
+
+        fingerprint = self.slow_query_log.record("SELECT 1;", ["email"], 0, 150)
+        for duration_ms in (200, 300, 250):
+            self.slow_query_log.record("SELECT 1;", ["email"], 3, duration_ms)
+            self.slow_query_log.add_plan(fingerprint, plan)
+        self.slow_query_log.record("SELECT 2;", ["first_name"], 1, 120)
+
+        self.assertEqual(len(self.slow_query_log.get_plans()), 2)
+
+        entries = self.slow_query_log.get_plans(fingerprint)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["slow_count"], 4)
+        self.assertEqual(entries[0]["max_duration_ms"], 300)
+        self.assertTrue(entries[0]["seq_scan"])
+        self.assertEqual(len(entries[0]["plans"]), 2)
+        self.assertEqual(entries[0]["plans"][0]["rows"], 3)
+        self.assertEqual(entries[0]["plans"][0]["duration_ms"], 250)
+
+    def test_explain(self):
+        db_manager = MagicMock()
+        db_manager.connect.side_effect = Exception("statement timeout")
+
+        fingerprint = self.slow_query_log.record("SELECT 1;", ["email"], 0, 150)
+        self.slow_query_log.explain(db_manager, fingerprint, "SELECT 1;", ())
+
+        self.assertEqual(self.slow_query_log.get_plans(fingerprint)[0]["plans"], [])
+
+    def test_record_evicts_oldest_fingerprint(self):
+        first_fingerprint = self.slow_query_log.record("SELECT 1;", ["email"], 0, 150)
+        second_fingerprint = self.slow_query_log.record("SELECT 2;", ["email"], 0, 150)
+        self.slow_query_log.record("SELECT 1;", ["email"], 0, 150)
+        self.slow_query_log.record("SELECT 3;", ["email"], 0, 150)
+
+        fingerprints = [entry["fingerprint"] for entry in self.slow_query_log.get_plans()]
+        self.assertEqual(len(fingerprints), 2)
+        self.assertIn(first_fingerprint, fingerprints)
+        self.assertNotIn(second_fingerprint, fingerprints)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.app_config import NimbleAPIConfig, SyncConfig
+from src.sync_scheduler import SyncScheduler, load_status
+
+
+class TestSyncScheduler(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = MagicMock()
+        self.nimble_api_config = NimbleAPIConfig(
+            NIMBLE_API_KEY="api_key",
+            NIMBLE_API_URL="http://example.com/api",
+        )
+        self.sync_scheduler = SyncScheduler(self.db_manager, self.nimble_api_config, SyncConfig(
+            SYNC_ENABLED=True,
+            SYNC_INTERVAL_SECONDS=60,
+            SYNC_JITTER_SECONDS=0,
+            SYNC_MAX_BACKOFF_SECONDS=300,
+            SYNC_FULL_INTERVAL_SECONDS=3600,
+        ))
+        self.nimble_contacts = {"resources": []}
+
+    def test_full_then_delta_sync(self):
+        with patch("src.sync_scheduler.get_contacts", return_value=self.nimble_contacts) as mock_get_contacts, \
+            patch("src.sync_scheduler.update_db", return_value=10) as mock_update_db, \
+            patch("src.sync_scheduler.upsert_db", return_value=2) as mock_upsert_db:
+
+            self.assertTrue(self.sync_scheduler.run_once())
+            self.assertTrue(self.sync_scheduler.run_once())
+
+        mock_update_db.assert_called_once_with(self.db_manager, self.nimble_contacts)
+        mock_upsert_db.assert_called_once_with(self.db_manager, self.nimble_contacts)
+        self.assertIsNone(mock_get_contacts.call_args_list[0][0][1])
+        self.assertIsNotNone(mock_get_contacts.call_args_list[1][0][1])
+
+        status = self.sync_scheduler.get_status()
+        self.assertFalse(status["last_run_full"])
+        self.assertEqual(status["last_rows_loaded"], 10)
+        self.assertEqual(status["last_rows_changed"], 2)
+        self.assertIsNotNone(status["last_run_duration_seconds"])
+        self.assertGreaterEqual(status["staleness_seconds"], 0)
+
+    def test_save_status(self):
+        with patch("src.sync_scheduler.get_contacts", return_value=self.nimble_contacts), \
+            patch("src.sync_scheduler.update_db", return_value=10), \
+            patch("src.sync_scheduler.save_sync_status") as mock_save_sync_status:
+
+            self.assertTrue(self.sync_scheduler.run_once())
+
+        self.assertEqual(mock_save_sync_status.call_count, 2)
+        started_status = mock_save_sync_status.call_args_list[0][0][1]
+        finished_status = mock_save_sync_status.call_args_list[1][0][1]
+        self.assertTrue(started_status["running"])
+        self.assertFalse(finished_status["running"])
+        self.assertEqual(finished_status["last_rows_loaded"], 10)
+        self.assertNotIn("staleness_seconds", finished_status)
+
+    def test_load_status(self):
+        with patch("src.sync_scheduler.load_sync_status", return_value=None):
+            self.assertIsNone(load_status(self.db_manager))
+
+        with patch("src.sync_scheduler.load_sync_status", return_value={"last_success_at": 1}):
+            self.assertGreater(load_status(self.db_manager)["staleness_seconds"], 0)
+
+    def test_backoff(self):
+        self.assertEqual(self.sync_scheduler.get_next_delay(), 60)
+
+        with patch("src.sync_scheduler.get_contacts", return_value=None):
+            for _ in range(3):
+                self.assertFalse(self.sync_scheduler.run_once())
+
+        status = self.sync_scheduler.get_status()
+        self.assertEqual(status["consecutive_failures"], 3)
+        self.assertIsNone(status["staleness_seconds"])
+        self.assertIsNotNone(status["last_error"])
+        self.assertEqual(self.sync_scheduler.get_next_delay(), 300)
+
+    def test_overlap(self):
+        with patch("src.sync_scheduler.get_contacts") as mock_get_contacts:
+            with self.sync_scheduler._lock:
+                self.assertTrue(self.sync_scheduler.is_running())
+                self.assertFalse(self.sync_scheduler.run_once())
+
+        mock_get_contacts.assert_not_called()
+        self.assertEqual(self.sync_scheduler.consecutive_failures, 0)
+
+    def test_start_and_stop(self):
+        updated = threading.Event()
+
+        def update_db(db_manager, nimble_contacts):
+            updated.set()
+            return 10
+
+        async def run_scheduler():
+            self.sync_scheduler.start()
+            self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, updated.wait, 10))
+            await self.sync_scheduler.stop()
+
+        with patch("src.sync_scheduler.get_contacts", return_value=self.nimble_contacts), \
+            patch("src.sync_scheduler.update_db", side_effect=update_db) as mock_update_db:
+
+            asyncio.run(run_scheduler())
+
+        mock_update_db.assert_called_once()
+        self.assertIsNone(self.sync_scheduler._task)
+
+
+if __name__ == '__main__':
+    unittest.main()
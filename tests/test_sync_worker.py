@@ -0,0 +1,49 @@
+import logging
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.sync_worker import sync_worker_main
+
+
+class TestMain(unittest.TestCase):
+    @patch('src.sync_worker.asyncio.run')
+    @patch('src.sync_worker.migrate_db')
+    @patch('src.sync_worker.SyncScheduler')
+    @patch('src.sync_worker.Env')
+    @patch('src.sync_worker.AppConfig')
+    @patch('src.sync_worker.DBManager')
+    def test_main(self, mock_db_manager, mock_app_config, mock_env, mock_sync_scheduler, mock_migrate_db, mock_run):
+        mock_env_instance = mock_env.return_value
+        mock_app_config_instance = mock_app_config.from_env.return_value
+        mock_app_config_instance.db_config = "dummy_db_config"
+        mock_db_manager_instance = mock_db_manager.return_value
+        mock_sync_scheduler_instance = mock_sync_scheduler.return_value
+
+        calls = MagicMock()
+        calls.attach_mock(mock_migrate_db, "migrate_db")
+        calls.attach_mock(mock_sync_scheduler_instance.run_forever, "run_forever")
+        calls.attach_mock(mock_run, "run")
+
+        logging.basicConfig(level=logging.CRITICAL)
+        logger = logging.getLogger(__name__)
+
+        sync_worker_main(logger)
+
+        mock_env.assert_called_once()
+        mock_app_config.from_env.assert_called_once_with(mock_env_instance)
+        mock_db_manager.assert_called_once_with("dummy_db_config")
+        mock_sync_scheduler.assert_called_once_with(
+            mock_db_manager_instance,
+            mock_app_config_instance.nimble_api_config,
+            mock_app_config_instance.sync_config,
+        )
+        mock_migrate_db.assert_called_once_with(mock_db_manager_instance)
+        mock_run.assert_called_once_with(mock_sync_scheduler_instance.run_forever.return_value)
+        self.assertEqual(
+            [name for name, _, _ in calls.mock_calls],
+            ["migrate_db", "run_forever", "run"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
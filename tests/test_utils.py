@@ -1,9 +1,13 @@
+from datetime import datetime
 from environs import Env
+import json
 import unittest
 from unittest.mock import MagicMock, patch
 
-from src.app_config import NimbleAPIConfig
-from src.utils import (get_from_csv, init_db_with_csv, get_contacts, update_db, prepare_db, get_valid_fields,
+from src.app_config import NimbleAPIConfig, SlowQueryConfig
+from src.query_log import SlowQueryLog
+from src.utils import (get_from_csv, init_db_with_csv, get_contacts, get_contacts_data, update_db, upsert_db,
+                       migrate_db, save_sync_status, load_sync_status, prepare_db, get_valid_fields,
                        get_search_condition, search_contacts, CSV_FILE_PATH,)
 
 
@@ -40,6 +44,66 @@ class TestMainUtils(unittest.TestCase):
         self.assertIsNotNone(contacts.get("resources"))
         self.assertIsNotNone(contacts["resources"][0].get("record_type"))
 
+    def test_get_contacts_updated_since(self):
+        nimble_api_config = NimbleAPIConfig(
+            NIMBLE_API_KEY="api_key",
+            NIMBLE_API_URL="http://example.com/api",
+        )
+
+        with patch("src.utils.requests.get") as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.json.return_value = {"resources": []}
+
+            contacts = get_contacts(nimble_api_config, datetime(2023, 8, 1, 12, 30))
+
+        self.assertEqual(contacts, {"resources": []})
+        params = mock_get.call_args[1]["params"]
+        self.assertEqual(json.loads(params["query"])["updated"]["range"]["start_date"], "2023-08-01")
+
+    def test_get_contacts_pages(self):
+        nimble_api_config = NimbleAPIConfig(
+            NIMBLE_API_KEY="api_key",
+            NIMBLE_API_URL="http://example.com/api",
+        )
+        first_page = MagicMock(status_code=200)
+        first_page.json.return_value = {"resources": [{"id": "1"}], "meta": {"page": 1, "pages": 2}}
+        second_page = MagicMock(status_code=200)
+        second_page.json.return_value = {"resources": [{"id": "2"}], "meta": {"page": 2, "pages": 2}}
+
+        with patch("src.utils.requests.get", side_effect=[first_page, second_page]) as mock_get:
+            contacts = get_contacts(nimble_api_config, datetime(2023, 8, 1))
+
+        self.assertEqual(contacts["resources"], [{"id": "1"}, {"id": "2"}])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args[1]["params"]["page"], 2)
+
+        failed_page = MagicMock(status_code=500)
+        with patch("src.utils.requests.get", side_effect=[first_page, failed_page]):
+            self.assertIsNone(get_contacts(nimble_api_config, datetime(2023, 8, 1)))
+
+    def test_get_contacts_data(self):
+        nimble_contacts = {
+            "resources": [
+                {
+                    "id": "5f2a",
+                    "fields": {
+                        "first name": [{"value": "John"}],
+                        "email": [{"value": "john@example.com"}]
+                    },
+                    "record_type": "person"
+                },
+                {
+                    "id": "6b3c",
+                    "fields": {"company name": [{"value": "Nimble"}]},
+                    "record_type": "company"
+                }
+            ]
+        }
+
+        contacts_data = get_contacts_data(nimble_contacts)
+
+        self.assertEqual(contacts_data, [("5f2a", "John", None, "john@example.com")])
+
     def test_update_db(self):
         db_manager = MagicMock()
         nimble_contacts = {
@@ -61,6 +125,79 @@ class TestMainUtils(unittest.TestCase):
         db_manager.connect.assert_called_once()
         db_manager.connect.return_value.__enter__.return_value.cursor.assert_called_once()
 
+    def test_update_db_failure(self):
+        db_manager = MagicMock()
+        mock_connection = db_manager.connect.return_value.__enter__.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.executemany.side_effect = Exception("connection lost")
+
+        with self.assertRaises(Exception):
+            update_db(db_manager, {"resources": []})
+
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+    def test_upsert_db(self):
+        db_manager = MagicMock()
+        nimble_contacts = {
+            "resources": [
+                {
+                    "id": "5f2a",
+                    "fields": {
+                        "first name": [{"value": "John"}],
+                        "last name": [{"value": "Doe"}],
+                        "email": [{"value": "john@example.com"}]
+                    },
+                    "record_type": "person"
+                },
+                {
+                    "fields": {"first name": [{"value": "Jane"}]},
+                    "record_type": "person"
+                }
+            ]
+        }
+
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+
+        mock_connection = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        db_manager.connect.return_value.__enter__.return_value = mock_connection
+
+        rows_changed = upsert_db(db_manager, nimble_contacts)
+
+        self.assertEqual(rows_changed, 1)
+        mock_cursor.executemany.assert_called_once()
+        self.assertEqual(mock_cursor.executemany.call_args[0][1], [("5f2a", "John", "Doe", "john@example.com")])
+        mock_connection.commit.assert_called_once()
+
+    def test_migrate_db(self):
+        db_manager = MagicMock()
+        mock_connection = db_manager.connect.return_value.__enter__.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+
+        migrate_db(db_manager)
+
+        self.assertIn("ADD COLUMN IF NOT EXISTS nimble_id", mock_cursor.execute.call_args[0][0])
+        mock_connection.commit.assert_called_once()
+
+    def test_save_and_load_sync_status(self):
+        db_manager = MagicMock()
+        mock_connection = db_manager.connect.return_value.__enter__.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+
+        save_sync_status(db_manager, {"running": False})
+
+        self.assertEqual(mock_cursor.execute.call_args[0][1][1].adapted, {"running": False})
+        mock_connection.commit.assert_called_once()
+
+        mock_cursor.fetchone.return_value = ({"running": False},)
+        self.assertEqual(load_sync_status(db_manager), {"running": False})
+
+        mock_cursor.fetchone.return_value = None
+        self.assertIsNone(load_sync_status(db_manager))
+
     def test_prepare_db_with_csv(self):
         db_manager = MagicMock()
         nimble_api_config = NimbleAPIConfig(
@@ -126,6 +263,12 @@ class TestMainUtils(unittest.TestCase):
 
         self.assertEqual(valid_fields, ["first_name", "last_name"])
 
+    def test_get_valid_fields_duplicates(self):
+        fields = "email,email,first name,first_name"
+        valid_fields = get_valid_fields(fields)
+
+        self.assertEqual(valid_fields, ["email", "first_name"])
+
     def test_get_search_condition(self):
         search_fields = ["first_name", "last_name"]
         search_condition = get_search_condition(search_fields)
@@ -159,6 +302,40 @@ class TestMainUtils(unittest.TestCase):
 
         self.assertEqual(contacts, [])
 
+    def test_search_contacts_slow_query(self):
+        db_manager = MagicMock()
+        background_tasks = MagicMock()
+        query = "John"
+        search_fields = ["first_name"]
+        slow_query_log = SlowQueryLog(SlowQueryConfig(
+            SLOW_QUERY_THRESHOLD_MS=0,
+            SLOW_QUERY_EXPLAIN_SAMPLE_RATE=1,
+            SLOW_QUERY_MAX_PLANS=10,
+            SLOW_QUERY_MAX_FINGERPRINTS=10,
+            SLOW_QUERY_EXPLAIN_TIMEOUT_MS=1000,
+        ))
+
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [{"id": 1, "first_name": "John"}]
+
+        mock_connection = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        db_manager.connect.return_value.__enter__.return_value = mock_connection
+
+        contacts = search_contacts(db_manager, query, search_fields, slow_query_log, background_tasks)
+
+        self.assertEqual(len(contacts), 1)
+        mock_cursor.execute.assert_called_once()
+
+        entries = slow_query_log.get_plans()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["fields"], search_fields)
+        self.assertEqual(entries[0]["slow_count"], 1)
+        background_tasks.add_task.assert_called_once_with(
+            slow_query_log.explain, db_manager, entries[0]["fingerprint"], mock_cursor.execute.call_args[0][0], (query,)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()